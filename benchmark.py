@@ -0,0 +1,499 @@
+"""Load and latency benchmark for the FinSight API.
+
+Seeds a deterministic dataset, serves `app` on a local threaded server and drives
+each route at a fixed concurrency, reporting p50/p95/p99 latency, throughput and
+SQL statements per request as JSON.
+
+    python benchmark.py run --users 50 --transactions 400 --concurrency 8 --output bench.json
+    python benchmark.py run --baseline baseline.json       # run, then compare
+    python benchmark.py compare baseline.json bench.json   # exit 1 on regression
+    python benchmark.py serialization --rows 10000         # ORM/to_dict vs Core rows/orjson
+    python benchmark.py startup --repeat 5 --baseline startup.json  # import and first-request time
+
+By default the app runs against a fresh SQLite file; pass --database-uri to point
+it at a MySQL stand-in instead (the schema is created and seeded there).
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+
+CATEGORIES = {
+    'Food & Dining': ['Lunch at Cafe Coffee Day', 'Swiggy dinner order', 'Zomato biryani', 'Groceries at DMart'],
+    'Transportation': ['Uber ride to office', 'Ola cab to airport', 'Metro card recharge', 'Petrol refill'],
+    'Shopping': ['Amazon order', 'Myntra clothes', 'Flipkart electronics'],
+    'Entertainment': ['Netflix subscription', 'Movie tickets PVR', 'Concert pass'],
+    'Bills & Utilities': ['Electricity bill', 'Mobile recharge', 'Broadband bill'],
+    'Healthcare': ['Pharmacy', 'Doctor consultation'],
+    'Travel': ['Train tickets IRCTC', 'Hotel booking'],
+    'Others': ['Gift for friend', 'Donation'],
+}
+MOODS = ['Happy', 'Neutral', 'Sad', 'Joyful', 'Stressed']
+LOCATIONS = ['Chennai', 'Bangalore', 'Mumbai', 'Delhi', 'Hyderabad', 'Pune', 'Kolkata']
+
+# Tolerances for `compare`: relative slowdown in p95 / drop in throughput, and
+# absolute growth in SQL statements per request.
+LATENCY_TOLERANCE = 0.20
+THROUGHPUT_TOLERANCE = 0.20
+QUERY_TOLERANCE = 0.5
+# Relative growth in import / time-to-first-request allowed by `compare`
+STARTUP_TOLERANCE = 0.25
+
+# Run in a fresh interpreter under `python -X importtime`. Prints one JSON line of
+# timings; the parent adds interpreter start-up by comparing wall clocks.
+STARTUP_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import finsightai_app
+imported = time.perf_counter()
+app = finsightai_app.create_app()
+created = time.perf_counter()
+with app.app_context():
+    finsightai_app.db.create_all()  # a cold worker finds its tables already there
+schema = time.perf_counter()
+response = app.test_client().get('/last_active_user')
+finished = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'schema_ms': (schema - created) * 1000,
+    'request_ms': (finished - schema) * 1000,
+    'status': response.status_code,
+    'finished_at': time.time(),
+}))
+"""
+
+
+def generate_transactions(rng, email, count, anchor):
+    """Deterministic transactions for one user spread over the 180 days before anchor."""
+    rows = []
+    for _ in range(count):
+        income = rng.random() < 0.05
+        category = 'Others' if income else rng.choice(list(CATEGORIES))
+        rows.append({
+            'user_email': email,
+            'amount': round(rng.lognormvariate(6, 1), 2),
+            'description': 'Salary credit' if income else rng.choice(CATEGORIES[category]),
+            'category': category,
+            'mood': rng.choice(MOODS),
+            'location': rng.choice(LOCATIONS),
+            'transaction_type': 'income' if income else 'expense',
+            'transaction_date': (anchor - timedelta(minutes=rng.randrange(180 * 24 * 60))).isoformat(),
+        })
+    return rows
+
+
+def seed(app_module, users, transactions, rng, anchor):
+    app, db = app_module.app, app_module.db
+    emails = [f"bench{index}@example.com" for index in range(users)]
+    with app.app_context():
+        db.create_all()
+        app_module.run_migrations()
+        for email in emails:
+            db.session.add(app_module.UserDetails(
+                name='Bench User', phone_number='0000000000', email=email, occupation='Engineer',
+                income=str(rng.randrange(30000, 200000, 1000)), financial_goal='Save more',
+                risk='Medium', location=rng.choice(LOCATIONS)
+            ))
+            for index in range(3):
+                db.session.add(app_module.Goal(
+                    user_email=email, title=f'Goal {index}', target=float(rng.randrange(10000, 500000, 1000)),
+                    current=float(rng.randrange(0, 10000, 100)), category='Savings',
+                    deadline=(anchor + timedelta(days=rng.randrange(30, 720))).date(),
+                    color='#6366F1', icon='savings', description=None,
+                    monthly_contribution=float(rng.randrange(1000, 20000, 500))
+                ))
+        db.session.commit()
+        for email in emails:
+            inserted, errors = app_module.bulk_insert_transactions(generate_transactions(rng, email, transactions, anchor))
+            if errors:
+                raise RuntimeError(f"Seeding {email} failed: {errors[:3]}")
+        ids = {}
+        for transaction_id, email in db.session.query(app_module.Transaction.id, app_module.Transaction.user_email):
+            ids.setdefault(email, []).append(transaction_id)
+    return emails, ids
+
+
+def install_query_counter(app, db):
+    """Count SQL statements per request thread and report them in a response header."""
+    from sqlalchemy import event
+
+    local = threading.local()
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def count_statement(*args):
+        local.queries = getattr(local, 'queries', 0) + 1
+
+    @app.before_request
+    def reset_query_count():
+        local.queries = 0
+
+    @app.after_request
+    def report_query_count(response):
+        response.headers['X-Bench-Queries'] = str(getattr(local, 'queries', 0))
+        return response
+
+
+def route_scenarios(emails, ids, rng):
+    """(name, method, request factory) for every route under test."""
+    def user():
+        return rng.choice(emails)
+
+    def transaction_id():
+        return rng.choice(ids[user()])
+
+    def new_transaction():
+        return generate_transactions(rng, user(), 1, datetime.now())[0]
+
+    return [
+        ('user_dashboard', 'GET', lambda: (f'/user_dashboard/{user()}', None)),
+        ('transaction_stats', 'GET', lambda: (f'/transaction_stats/{user()}', None)),
+        ('user_transactions', 'GET', lambda: (f'/user_transactions/{user()}', None)),
+        ('recent_transactions', 'GET', lambda: (f'/recent_transactions/{user()}/20', None)),
+        ('transactions_by_category', 'GET', lambda: (f'/transactions_by_category/{user()}/Shopping', None)),
+        ('moods_transactions', 'GET', lambda: (f'/moods_transactions/{user()}', None)),
+        ('top_spending_locations', 'GET', lambda: (f'/top_spending_locations/{user()}', None)),
+        ('ai_suggestions', 'GET', lambda: (f'/ai_suggestions/{user()}', None)),
+        ('goals', 'GET', lambda: (f'/goals/{user()}', None)),
+        ('calendar_events', 'GET', lambda: (f'/calendar_events/{user()}', None)),
+        ('add_transaction', 'POST', lambda: ('/add_transaction', new_transaction())),
+        ('update_transaction', 'PUT', lambda: (f'/update_transaction/{transaction_id()}',
+                                               {'amount': round(rng.uniform(10, 5000), 2), 'mood': rng.choice(MOODS)})),
+        ('add_transactions_bulk', 'POST', lambda: ('/add_transactions_bulk',
+                                                   [new_transaction() for _ in range(20)])),
+    ]
+
+
+def send(base_url, method, path, body):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={'Content-Type': 'application/json'} if data else {})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            response.read()
+            status, queries = response.status, response.headers.get('X-Bench-Queries')
+    except urllib.error.HTTPError as e:
+        e.read()
+        status, queries = e.code, e.headers.get('X-Bench-Queries')
+    return time.perf_counter() - started, status, int(queries or 0)
+
+
+def drive(base_url, method, factory, requests, concurrency):
+    # Build requests up front so the random stream does not depend on thread timing
+    calls = [factory() for _ in range(requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(lambda call: send(base_url, method, *call), calls))
+    elapsed = time.perf_counter() - started
+    latencies = np.array([latency for latency, _, _ in results]) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'requests': requests,
+        'errors': sum(1 for _, status, _ in results if status >= 400),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'mean_ms': round(float(latencies.mean()), 3),
+        'throughput_rps': round(requests / elapsed, 2),
+        'queries_per_request': round(sum(queries for _, _, queries in results) / requests, 2),
+    }
+
+
+def benchmark_routes(app_module, emails, ids, rng, args):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args):
+            pass
+
+    install_query_counter(app_module.app, app_module.db)
+    server = make_server('127.0.0.1', 0, app_module.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    selected = set(args.routes.split(',')) if args.routes else None
+    routes = {}
+    try:
+        for name, method, factory in route_scenarios(emails, ids, rng):
+            if selected and name not in selected:
+                continue
+            if args.warmup:
+                drive(base_url, method, factory, args.warmup, args.concurrency)
+            routes[name] = drive(base_url, method, factory, args.requests, args.concurrency)
+            print(f"{name:26s} p50 {routes[name]['p50_ms']:9.2f} ms  p95 {routes[name]['p95_ms']:9.2f} ms  "
+                  f"{routes[name]['throughput_rps']:8.1f} req/s  {routes[name]['queries_per_request']:5.1f} q/req  "
+                  f"{routes[name]['errors']} errors", file=sys.stderr)
+    finally:
+        server.shutdown()
+    return routes
+
+
+def load_app(database_uri):
+    """Import the app bound to database_uri (a temporary SQLite file when None)."""
+    if not database_uri:
+        workdir = tempfile.mkdtemp(prefix='finsight-bench-')
+        database_uri = f"sqlite:///{os.path.join(workdir, 'bench.db')}?timeout=30"
+    os.environ['FINSIGHT_DATABASE_URI'] = database_uri
+    # Every simulated client shares one IP; admission limits would turn the run into 429s
+    os.environ.setdefault('FINSIGHT_RATE_LIMITING', '0')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import finsightai_app as app_module
+    return app_module, database_uri
+
+
+def run(args):
+    app_module, database_uri = load_app(args.database_uri)
+
+    rng = random.Random(args.seed)
+    anchor = datetime.fromisoformat(args.anchor) if args.anchor else datetime.now().replace(
+        hour=0, minute=0, second=0, microsecond=0)
+    started = time.perf_counter()
+    emails, ids = seed(app_module, args.users, args.transactions, rng, anchor)
+    seed_seconds = time.perf_counter() - started
+    routes = benchmark_routes(app_module, emails, ids, rng, args)
+
+    report = {
+        'meta': {
+            'users': args.users,
+            'transactions_per_user': args.transactions,
+            'concurrency': args.concurrency,
+            'requests_per_route': args.requests,
+            'seed': args.seed,
+            'anchor': anchor.isoformat(),
+            'database': database_uri.split('://', 1)[0],
+            'seed_seconds': round(seed_seconds, 2),
+            'python': platform.python_version(),
+            'created_at': datetime.utcnow().isoformat(),
+        },
+        'routes': routes,
+    }
+    write_report(report, args.output)
+    if args.baseline:
+        with open(args.baseline) as f:
+            return report_regressions(compare(json.load(f), report))
+    return 0
+
+
+def legacy_user_transactions(app_module, email):
+    """The ORM + to_dict() + jsonify path the list routes used before the Core row serializer."""
+    transactions = app_module.newest_first(
+        app_module.Transaction.query.filter(app_module.owned_by(app_module.Transaction, email))
+    ).all()
+    return app_module.jsonify({
+        "status": "success",
+        "transactions": [transaction.to_dict() for transaction in transactions],
+        "count": len(transactions),
+        "message": f"Found {len(transactions)} transactions for {email}"
+    })
+
+
+def serialization(args):
+    """Time /user_transactions for one large user through the old and the current serializer."""
+    app_module, database_uri = load_app(args.database_uri)
+    app = app_module.app
+    rng = random.Random(args.seed)
+    emails, _ = seed(app_module, 1, args.rows, rng, datetime.now())
+    email = emails[0]
+    paths = {
+        'orm_to_dict_jsonify': lambda: legacy_user_transactions(app_module, email),
+        'core_rows_fast_json': lambda: app_module.get_user_transactions(email),
+    }
+    timings = {}
+    bodies = {}
+    for name, call in paths.items():
+        samples = []
+        for _ in range(args.repeat + 1):
+            with app.test_request_context(f'/user_transactions/{email}'):
+                started = time.perf_counter()
+                response = call()
+                body = response.get_data()
+                samples.append((time.perf_counter() - started) * 1000)
+                app_module.db.session.remove()
+        bodies[name] = json.loads(body)
+        samples = samples[1:]  # the first call warms caches and the statement cache
+        timings[name] = {'p50_ms': round(float(np.percentile(samples, 50)), 3),
+                         'min_ms': round(min(samples), 3), 'bytes': len(body)}
+    if bodies['orm_to_dict_jsonify'] != bodies['core_rows_fast_json']:
+        raise RuntimeError("The two serializers produced different documents")
+    report = {
+        'meta': {'rows': args.rows, 'repeat': args.repeat, 'database': database_uri.split('://', 1)[0],
+                 'encoder': 'orjson' if app_module.orjson is not None else 'json'},
+        'serialization': timings,
+        'speedup': round(timings['orm_to_dict_jsonify']['p50_ms'] / timings['core_rows_fast_json']['p50_ms'], 2),
+    }
+    write_report(report, args.output)
+    return 0
+
+
+def parse_importtime(stderr, module='finsightai_app'):
+    """(cumulative us of module, {direct import: cumulative us}) from `-X importtime` output."""
+    pending = []  # (depth, name, cumulative) of lines not yet claimed by a parent
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        if name == module:
+            children = {child: us for child_depth, child, us in pending if child_depth == depth + 1}
+            return int(cumulative), children
+        # Lines are written after their children; a line closes every deeper pending one
+        pending = [entry for entry in pending if entry[0] <= depth]
+        pending.append((depth, name, int(cumulative)))
+    raise RuntimeError(f"{module} does not appear in the importtime output")
+
+
+def probe_startup(database_uri):
+    env = dict(os.environ, FINSIGHT_DATABASE_URI=database_uri)
+    spawned = time.time()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP_PROBE], env=env,
+                               cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup probe failed:\n{completed.stderr[-2000:]}")
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    module_us, imports = parse_importtime(completed.stderr)
+    timings['module_import_ms'] = module_us / 1000
+    # From spawning the interpreter to the first response, minus the probe's own schema setup
+    timings['first_request_ms'] = (timings.pop('finished_at') - spawned) * 1000 - timings['schema_ms']
+    return timings, imports
+
+
+def startup(args):
+    """Median import time and time-to-first-request over fresh interpreters."""
+    workdir = tempfile.mkdtemp(prefix='finsight-startup-')
+    database_uri = args.database_uri or f"sqlite:///{os.path.join(workdir, 'startup.db')}"
+    runs = [probe_startup(database_uri) for _ in range(args.repeat)]
+    if any(timings['status'] >= 500 for timings, _ in runs):
+        raise RuntimeError("First request failed during the startup probe")
+
+    def median(values):
+        return round(float(np.median(values)), 2)
+
+    keys = ('module_import_ms', 'import_ms', 'create_app_ms', 'request_ms', 'first_request_ms')
+    imports = {}
+    for _, run_imports in runs:
+        for name, us in run_imports.items():
+            imports.setdefault(name, []).append(us / 1000)
+    heaviest = sorted(imports.items(), key=lambda item: -np.median(item[1]))[:args.top]
+    report = {
+        'meta': {'repeat': args.repeat, 'database': database_uri.split('://', 1)[0],
+                 'python': platform.python_version(), 'created_at': datetime.utcnow().isoformat()},
+        'startup': {key: median([timings[key] for timings, _ in runs]) for key in keys},
+        'imports': {name: median(values) for name, values in heaviest},
+    }
+    for key, value in report['startup'].items():
+        print(f"{key:18s} {value:9.2f} ms", file=sys.stderr)
+    write_report(report, args.output)
+    if args.baseline:
+        with open(args.baseline) as f:
+            return report_regressions(compare(json.load(f), report))
+    return 0
+
+
+def compare(baseline, current):
+    """List of human-readable regressions of current against baseline, route by route
+    and for start-up times."""
+    regressions = []
+    for key in ('module_import_ms', 'first_request_ms'):
+        before = baseline.get('startup', {}).get(key)
+        after = current.get('startup', {}).get(key)
+        if before is not None and after is not None and after > before * (1 + STARTUP_TOLERANCE):
+            regressions.append(f"startup: {key} {before} -> {after}")
+    for name, before in baseline.get('routes', {}).items():
+        after = current.get('routes', {}).get(name)
+        if after is None:
+            continue
+        if after['p95_ms'] > before['p95_ms'] * (1 + LATENCY_TOLERANCE):
+            regressions.append(f"{name}: p95 {before['p95_ms']} ms -> {after['p95_ms']} ms")
+        if after['throughput_rps'] < before['throughput_rps'] * (1 - THROUGHPUT_TOLERANCE):
+            regressions.append(f"{name}: throughput {before['throughput_rps']} -> {after['throughput_rps']} req/s")
+        if after['queries_per_request'] > before['queries_per_request'] + QUERY_TOLERANCE:
+            regressions.append(f"{name}: queries/request {before['queries_per_request']} -> {after['queries_per_request']}")
+        if after['errors'] > before['errors']:
+            regressions.append(f"{name}: errors {before['errors']} -> {after['errors']}")
+    return regressions
+
+
+def report_regressions(regressions):
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if not regressions:
+        print("No regressions against baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def write_report(report, path):
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if path:
+        with open(path, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text, file=sys.__stdout__)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Seed a database and benchmark every route.')
+    run_parser.add_argument('--users', type=int, default=20)
+    run_parser.add_argument('--transactions', type=int, default=200, help='Transactions per user.')
+    run_parser.add_argument('--concurrency', type=int, default=4)
+    run_parser.add_argument('--requests', type=int, default=200, help='Measured requests per route.')
+    run_parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per route.')
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--anchor', help='ISO date the generated history ends at (default: today).')
+    run_parser.add_argument('--routes', help='Comma-separated route names to run (default: all).')
+    run_parser.add_argument('--database-uri', help='SQLAlchemy URI of an empty database (default: temporary SQLite).')
+    run_parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+    run_parser.add_argument('--baseline', help='Compare against this report and exit 1 on regression.')
+
+    serialization_parser = commands.add_parser('serialization', help='Compare list-route serializers on one large user.')
+    serialization_parser.add_argument('--rows', type=int, default=10000)
+    serialization_parser.add_argument('--repeat', type=int, default=10)
+    serialization_parser.add_argument('--seed', type=int, default=42)
+    serialization_parser.add_argument('--database-uri', help='SQLAlchemy URI of an empty database (default: temporary SQLite).')
+    serialization_parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+
+    startup_parser = commands.add_parser('startup', help='Measure import time and time-to-first-request.')
+    startup_parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters to take the median over.')
+    startup_parser.add_argument('--top', type=int, default=15, help='Heaviest direct imports to list.')
+    startup_parser.add_argument('--database-uri', help='SQLAlchemy URI to connect to (default: temporary SQLite).')
+    startup_parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+    startup_parser.add_argument('--baseline', help='Compare against this report and exit 1 on regression.')
+
+    compare_parser = commands.add_parser('compare', help='Compare two reports.')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+
+    args = parser.parse_args(argv)
+    # The app prints progress from routes and worker threads; stdout is kept for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.command == 'run':
+            return run(args)
+        if args.command == 'serialization':
+            return serialization(args)
+        if args.command == 'startup':
+            return startup(args)
+    with open(args.baseline) as f, open(args.current) as g:
+        return report_regressions(compare(json.load(f), json.load(g)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
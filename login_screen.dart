@@ -85,6 +85,7 @@ class _LoginScreenState extends State<LoginScreen> {
       final responseData = json.decode(response.body);
 
       if (response.statusCode == 200 || response.statusCode == 201) {
+        Session.token = responseData['session']['token'];
         print('User added to active list: ${responseData['message']}');
       } else {
         print('Failed to add user to active list: ${responseData['message']}');
@@ -133,10 +133,17 @@ class _SelectMoodScreenState extends State<SelectMoodScreen>
 
   Future<void> _saveMoodToDatabase(String mood) async {
     try {
+      // Moods are saved against the signed-in user's session token
+      if (Session.token == null) {
+        print('Failed to save mood: not signed in');
+        return;
+      }
+
       final response = await http.post(
         Uri.parse('$baseUrl/add_mood'),
         headers: {
           'Content-Type': 'application/json',
+          'Authorization': 'Bearer ${Session.token}',
         },
         body: json.encode({
           'mood': mood,
@@ -1,4 +1,8 @@
 class Url{
   static String Urls='http://10.158.67.210:5000';
 }
+// Session token returned by /add_active at login; sent as a Bearer token to identify the signed-in user
+class Session{
+  static String? token;
+}
 //${Url.Urls}
\ No newline at end of file